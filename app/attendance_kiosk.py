@@ -15,20 +15,35 @@ What this does:
     -> suggestions appear (close spelling matches)
     -> admin can add them, but they are ALWAYS added as "Unregistered"
 - No duplicates per day: the same student cannot be logged twice on the same date sheet.
+- Each sign-in is also appended to data/YYYY-MM-DD.csv (cheap, no workbook rewrite).
+  Sign-ins reach the .xlsx on the next workbook save (new day, adding a student,
+  closing the app); any CSV rows missing from the workbook are merged in at startup,
+  and the CSV is removed once a save has captured it.
 
 Best-practice notes:
 - Keep data files in /data, code in /app.
-- Use a virtual environment (.venv) and install openpyxl.
+- Use a virtual environment (.venv) and install openpyxl + rapidfuzz (see requirements.txt;
+  pandas is only imported for very large Students sheets).
 - Avoid hardcoding student lists in code; keep them in the Students sheet.
 """
 
 import os
-from datetime import datetime
-import difflib
+import bisect
+import contextlib
+import csv
+import glob
+import itertools
+import queue
+import threading
+import time
+import traceback
+import zipfile
+from datetime import date, datetime
 import tkinter as tk
 from tkinter import messagebox
 from openpyxl import Workbook, load_workbook
 from openpyxl.utils import get_column_letter
+from rapidfuzz import process, fuzz
 
 
 # -------------------------
@@ -42,6 +57,9 @@ DATE_FORMAT = "%Y-%m-%d"      # daily sheet name like 2026-01-06
 STUDENTS_SHEET = "Students"   # master list
 STATUS_REGISTERED = "Registered"
 STATUS_UNREGISTERED = "Unregistered"
+SUGGEST_DELAY_MS = 120        # wait this long after the last keystroke before suggesting
+SAVE_COALESCE_SECONDS = 0.5   # saves requested within this window are written once
+PANDAS_MIN_ROWS = 2000        # Students sheets bigger than this are loaded with pandas
 
 
 # -------------------------
@@ -52,25 +70,82 @@ def ensure_data_dir():
     os.makedirs(DATA_DIR, exist_ok=True)
 
 
+def _canon(s: str) -> str:
+    """Canonical (case-insensitive) form of a name; compute it once and pass it along."""
+    return s.strip().casefold()
+
+
 def autosize_columns(ws):
-    """Autosize columns for readability (simple approach)."""
-    for col in range(1, ws.max_column + 1):
-        max_len = 0
+    """
+    Autosize columns for readability (simple approach).
+
+    Full scan of the sheet, so only use it once per sheet; afterwards keep the
+    returned widths and call widen_columns() for each appended row.
+
+    Returns: dict column_letter -> longest value length
+    """
+    # One pass over plain values (no Cell objects, no str() for values already strings)
+    lengths = [0] * ws.max_column
+    for row in ws.iter_rows(values_only=True):
+        for i, v in enumerate(row):
+            if v is not None:
+                w = len(v) if isinstance(v, str) else len(str(v))
+                if w > lengths[i]:
+                    lengths[i] = w
+
+    widths = {}
+    for col, max_len in enumerate(lengths, 1):
         col_letter = get_column_letter(col)
-        for cell in ws[col_letter]:
-            if cell.value is not None:
-                max_len = max(max_len, len(str(cell.value)))
         ws.column_dimensions[col_letter].width = min(max_len + 2, 45)
+        widths[col_letter] = max_len
+    return widths
+
+
+def widen_columns(ws, widths, row):
+    """Grow column widths to fit a newly appended row (only touches its columns)."""
+    for col, value in enumerate(row, 1):
+        if value is None:
+            continue
+        col_letter = get_column_letter(col)
+        w = len(str(value))
+        if w > widths.get(col_letter, 0):
+            widths[col_letter] = w
+            ws.column_dimensions[col_letter].width = min(w + 2, 45)
+
+
+def column_widths(ws, col_widths):
+    """
+    Cached widths for a sheet, measured on first use.
+    col_widths: dict sheet title -> widths (as returned by autosize_columns)
+    """
+    widths = col_widths.get(ws.title)
+    if widths is None:
+        widths = col_widths[ws.title] = autosize_columns(ws)
+    return widths
+
+
+def _atomic_save(wb, path):
+    """Save via a temp file + rename so a crash mid-save never leaves a half-written workbook."""
+    tmp = path + ".tmp"
+    wb.save(tmp)
+    os.replace(tmp, path)
 
 
 def get_or_create_workbook(path):
-    """Open an existing workbook or create a new one."""
+    """
+    Open an existing workbook or create a new one.
+    A new workbook is written once, already holding the Students sheet + headers.
+    """
     if os.path.exists(path):
         return load_workbook(path)
 
     wb = Workbook()
-    wb.save(path)
-    return load_workbook(path)
+    wb.remove(wb.active)
+    ws = wb.create_sheet(STUDENTS_SHEET)
+    ws.append(["Name", "OfficialStatus"])
+    autosize_columns(ws)
+    _atomic_save(wb, path)
+    return wb
 
 
 def get_or_create_students_sheet(wb):
@@ -78,7 +153,12 @@ def get_or_create_students_sheet(wb):
     Ensure the master Students sheet exists with headers:
       Name | OfficialStatus
 
-    Also upgrades old versions that used "Registered Student Name".
+    Also upgrades old versions that used "Registered Student Name" (or a "Name"
+    header with no status column). Only needed once per workbook load: the app keeps
+    the returned sheet instead of calling this again.
+
+    Does not save or autosize; the caller does both when changed is True.
+    Returns: (ws, changed)
     """
     if STUDENTS_SHEET in wb.sheetnames:
         ws = wb[STUDENTS_SHEET]
@@ -95,35 +175,59 @@ def get_or_create_students_sheet(wb):
                 status_val = ws.cell(row=r, column=2).value
                 if name_val and not status_val:
                     ws.cell(row=r, column=2, value=STATUS_REGISTERED)
-            autosize_columns(ws)
-            wb.save(WORKBOOK_PATH)
+            return ws, True
 
-        return ws
+        return ws, False
 
     ws = wb.create_sheet(STUDENTS_SHEET)
     ws.append(["Name", "OfficialStatus"])
-    autosize_columns(ws)
-    wb.save(WORKBOOK_PATH)
-    return ws
+    return ws, True
 
 
-def load_students(wb):
+def load_students(path):
     """
     Load students from Students sheet.
 
+    Uses a separate read-only handle (streams the sheet XML instead of building
+    the full workbook in memory), so the Students sheet must already be saved to disk.
+    Large rosters (> PANDAS_MIN_ROWS rows) are read with pandas instead.
+
     Returns:
       students: dict casefold(name) -> (OfficialName, OfficialStatus)
       names: list of OfficialName (for suggestions / display)
     """
-    ws = get_or_create_students_sheet(wb)
+    ro_wb = load_workbook(path, read_only=True, data_only=True)
+    try:
+        if STUDENTS_SHEET not in ro_wb.sheetnames:
+            return {}, []
+        ws = ro_wb[STUDENTS_SHEET]
+        if (ws.max_row or 0) <= PANDAS_MIN_ROWS:
+            return students_from_rows(ws.iter_rows(min_row=2, values_only=True))
+    finally:
+        ro_wb.close()
+
+    # Imported here so small deployments never pay the pandas import cost
+    import pandas as pd
+
+    df = pd.read_excel(path, sheet_name=STUDENTS_SHEET, engine="openpyxl", usecols=[0, 1], dtype=str)
+    df = df.astype(object).where(df.notna(), None)
+    return students_from_rows(df.itertuples(index=False, name=None))
+
+
+def students_from_rows(rows):
+    """Build (students, names) as described in load_students from Students data rows."""
     students = {}
     names = []
 
-    for row in ws.iter_rows(min_row=2, values_only=True):
+    for row in rows:
         if not row or not row[0]:
             continue
-        name = str(row[0]).strip()
-        status = str(row[1]).strip() if len(row) > 1 and row[1] else STATUS_UNREGISTERED
+        name = row[0] if isinstance(row[0], str) else str(row[0])
+        name = name.strip()
+        status = row[1] if len(row) > 1 and row[1] else STATUS_UNREGISTERED
+        if not isinstance(status, str):
+            status = str(status)
+        status = status.strip()
 
         key = name.casefold()
         # Deduplicate by case-insensitive key (keep first occurrence)
@@ -134,94 +238,173 @@ def load_students(wb):
     return students, names
 
 
-def add_student_as_unregistered(wb, name: str):
-    """Add a new student to Students sheet as Unregistered (always)."""
+def add_student_as_unregistered(ws, name: str, students: dict, names: list[str], col_widths: dict):
+    """
+    Add a new student to the Students sheet (ws) as Unregistered (always).
+
+    students / names are the in-memory registry (see load_students); they are the
+    duplicate check and are updated here, so the sheet is never re-read.
+    Does not save; the caller schedules the workbook save.
+    """
     name = name.strip()
     if not name:
         return False, "Name cannot be empty."
 
-    students, _ = load_students(wb)
-    if name.casefold() in students:
+    key = name.casefold()
+    if key in students:
         return False, "That student already exists in Students."
+    students[key] = (name, STATUS_UNREGISTERED)
+    names.append(name)
 
-    ws = get_or_create_students_sheet(wb)
-    ws.append([name, STATUS_UNREGISTERED])
-    autosize_columns(ws)
-    wb.save(WORKBOOK_PATH)
+    widths = column_widths(ws, col_widths)
+    row = [name, STATUS_UNREGISTERED]
+    ws.append(row)
+    widen_columns(ws, widths, row)
     return True, f"Added as Unregistered: {name}"
 
 
-def get_or_create_daily_sheet(wb):
-    """Create today's attendance sheet named YYYY-MM-DD with headers."""
-    sheet_name = datetime.now().strftime(DATE_FORMAT)
+def get_or_create_daily_sheet(wb, sheet_name=None):
+    """
+    Create today's (or sheet_name's) attendance sheet named YYYY-MM-DD with headers.
+    Not saved here; it goes out with the next workbook save.
+    """
+    if sheet_name is None:
+        sheet_name = datetime.now().strftime(DATE_FORMAT)
     if sheet_name not in wb.sheetnames:
         ws = wb.create_sheet(sheet_name)
         ws.append(["Time", "Name", "OfficialStatus"])
         autosize_columns(ws)
-        wb.save(WORKBOOK_PATH)
     return wb[sheet_name], sheet_name
 
 
-def already_signed_in_today(ws, name: str) -> bool:
-    """True if 'name' already exists on today's sheet (case-insensitive)."""
-    target = name.strip().casefold()
-    if not target:
-        return False
-
+def load_signed_in(ws) -> set:
+    """Casefolded names already on a daily sheet (scanned once per sheet)."""
+    signed = set()
     # Columns: Time | Name | OfficialStatus
     for row in ws.iter_rows(min_row=2, values_only=True):
         if not row or len(row) < 2 or not row[1]:
             continue
-        existing_name = str(row[1]).strip().casefold()
-        if existing_name == target:
-            return True
-    return False
+        signed.add(_canon(row[1] if isinstance(row[1], str) else str(row[1])))
+    return signed
 
 
-def log_attendance(wb, name: str, status: str):
+def already_signed_in_today(signed_today: set, key: str) -> bool:
+    """True if key (_canon(name)) is in today's signed-in set."""
+    return key in signed_today
+
+
+def day_csv_path(sheet_name):
+    return os.path.join(DATA_DIR, f"{sheet_name}.csv")
+
+
+def append_day_csv(sheet_name, row):
+    """Append one attendance row to the day's CSV (header written when the file is new)."""
+    path = day_csv_path(sheet_name)
+    is_new = not os.path.exists(path)
+    with open(path, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(["Time", "Name", "OfficialStatus"])
+        writer.writerow(row)
+
+
+def merge_day_csvs(wb) -> bool:
     """
-    Log attendance for today.
-    Returns: (sheet_name, did_log_bool)
+    Append day-CSV rows that are missing from their daily sheets (e.g. after a crash
+    before the workbook was saved). Returns True if the workbook changed.
     """
-    ws, sheet_name = get_or_create_daily_sheet(wb)
+    changed = False
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "*.csv"))):
+        sheet_name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            datetime.strptime(sheet_name, DATE_FORMAT)
+        except ValueError:
+            continue
 
-    if already_signed_in_today(ws, name):
+        ws, _ = get_or_create_daily_sheet(wb, sheet_name)
+        signed = load_signed_in(ws)
+        with open(path, newline="", encoding="utf-8") as f:
+            for row in itertools.islice(csv.reader(f), 1, None):
+                if len(row) < 3:
+                    continue
+                key = _canon(row[1])
+                if key in signed:
+                    continue
+                ws.append(row[:3])
+                signed.add(key)
+                changed = True
+    return changed
+
+
+def clear_day_csvs():
+    """Remove day CSVs once a workbook save has captured their rows."""
+    for path in glob.glob(os.path.join(DATA_DIR, "*.csv")):
+        sheet_name = os.path.splitext(os.path.basename(path))[0]
+        try:
+            datetime.strptime(sheet_name, DATE_FORMAT)
+        except ValueError:
+            continue
+        os.remove(path)
+
+
+def log_attendance(ws, name: str, status: str, col_widths: dict, signed_today: set):
+    """
+    Log attendance on today's sheet (ws): appended to the in-memory daily sheet and to the
+    day's CSV. Does not save the workbook; the CSV keeps the row safe until the next save.
+    signed_today: casefolded names already on ws (see load_signed_in); updated here
+    Returns: (sheet_name, did_log_bool)
+    """
+    sheet_name = ws.title
+    key = _canon(name)
+    if already_signed_in_today(signed_today, key):
         return sheet_name, False
 
+    widths = column_widths(ws, col_widths)
     time_str = datetime.now().strftime("%H:%M:%S")
-    ws.append([time_str, name, status])
-    autosize_columns(ws)
-    wb.save(WORKBOOK_PATH)
+    row = [time_str, name, status]
+    ws.append(row)
+    append_day_csv(sheet_name, row)
+    signed_today.add(key)
+    widen_columns(ws, widths, row)
     return sheet_name, True
 
 
 # -------------------------
 # Matching / validation
 # -------------------------
-def canonical_match(typed: str, students: dict):
+def canonical_match_cf(typed_cf: str, students: dict):
     """
-    Return (OfficialName, OfficialStatus) if typed matches a student (case-insensitive), else None.
-    students: dict casefold(name) -> (OfficialName, OfficialStatus)
+    Return (OfficialName, OfficialStatus) if typed_cf (text in _canon() form) matches a
+    student, else None. students: dict casefold(name) -> (OfficialName, OfficialStatus)
+
+    Keys are unique casefolded names (load_students keeps the first occurrence), so a
+    single dict.get is the whole lookup.
     """
-    t = typed.strip()
-    if not t:
+    if not typed_cf:
         return None
-    key = t.casefold()
-    return students.get(key)
+    return students.get(typed_cf)
 
 
-def get_suggestions(typed: str, names: list[str], n=6):
-    """Return close-match suggestions for spelling mistakes."""
-    t = typed.strip()
-    if not t:
+def get_suggestions_cf(t_cf: str, name_keys: list[str], name_map: dict, n=6):
+    """
+    Return close-match suggestions for spelling mistakes in t_cf (text in _canon() form).
+
+    name_keys: SORTED casefolded names, name_map: casefold(name) -> OfficialName.
+    Both are built once per registry load so this (called per keystroke) does no
+    list/dict construction; matching is case-insensitive but we display official spellings.
+    """
+    if not t_cf:
         return []
 
-    # Build casefold map so difflib matches are case-insensitive but we display official spellings
-    name_map = {nm.casefold(): nm for nm in names}
-    keys = list(name_map.keys())
+    # Fast path: while the student is still typing a correct name, the text is a
+    # prefix of enough official names that fuzzy matching isn't needed.
+    i = bisect.bisect_left(name_keys, t_cf)
+    hits = list(itertools.takewhile(lambda k: k.startswith(t_cf), name_keys[i:i + n]))
+    if len(hits) >= n:
+        return [name_map[k] for k in hits]
 
-    close = difflib.get_close_matches(t.casefold(), keys, n=n, cutoff=0.70)
-    return [name_map[c] for c in close]
+    close = process.extract(t_cf, name_keys, scorer=fuzz.WRatio, score_cutoff=70, limit=n)
+    return [name_map[key] for key, _score, _idx in close]
 
 
 # -------------------------
@@ -239,7 +422,20 @@ class AttendanceApp:
             self.root.attributes("-fullscreen", True)
             self.root.bind("<Escape>", lambda e: self.root.attributes("-fullscreen", False))
 
-        self.reload_registry()
+        # Workbook saves run on a background thread; back-to-back requests are coalesced
+        self._wb_lock = threading.Lock()
+        self._save_queue = queue.Queue()
+        self._defer = 0             # bulk_edit() nesting depth
+        self._save_pending = False  # save requested inside bulk_edit()
+        self._dirty_sheets = set()  # sheet titles to autosize when bulk_edit() ends
+        self._today_name = None     # daily sheet in use (kept across reloads to spot a new day)
+        self._unsaved = False       # self.wb has changes that are not on disk yet
+        self._pending_adds = []     # students added since the last save (see sync_with_disk)
+        threading.Thread(target=self._saver_loop, daemon=True).start()
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        with self._wb_lock:
+            self.open_workbook()
 
         # Title
         tk.Label(root, text="BUI Attendance", font=("Arial", 34, "bold"), bg="white").pack(pady=(40, 10))
@@ -260,6 +456,8 @@ class AttendanceApp:
         self.sugg_list = tk.Listbox(root, font=("Arial", 16), height=6, width=34)
         self.sugg_list.pack(pady=(0, 15))
         self.sugg_list.bind("<<ListboxSelect>>", self.on_pick_suggestion)
+        self._current_suggs = []  # what the Listbox currently shows
+        self._last_typed = None   # _canon() text the current suggestions were computed for
 
         # Buttons
         btn_frame = tk.Frame(root, bg="white")
@@ -271,7 +469,8 @@ class AttendanceApp:
 
         # Bindings
         self.root.bind("<Return>", self.on_submit)
-        self.entry.bind("<KeyRelease>", lambda e: self.refresh_suggestions())
+        self._sugg_after = None  # pending Tk after() id for debounced suggestions
+        self.entry.bind("<KeyRelease>", self.on_key_release)
 
         # Footer
         tk.Label(
@@ -283,11 +482,162 @@ class AttendanceApp:
         ).pack(side="bottom", pady=20)
 
     # ---- Registry management ----
-    def reload_registry(self):
+    def open_workbook(self):
+        """
+        Open the workbook once and keep it in memory (self.wb), along with the
+        Students registry and per-sheet caches. Call with self._wb_lock held.
+        """
         ensure_data_dir()
         self.wb = get_or_create_workbook(WORKBOOK_PATH)
-        get_or_create_students_sheet(self.wb)
-        self.students, self.names = load_students(self.wb)
+        self._col_widths = {}  # sheet title -> column widths, measured once per sheet
+        self._today_date = None  # today's sheet handle is (re)fetched on the next sign-in
+
+        # Header checked/upgraded once per load; sign-ins not yet saved come back from the day CSVs
+        with self.bulk_edit():
+            self._students_ws, changed = get_or_create_students_sheet(self.wb)
+            if changed:
+                self.autosize(self._students_ws)
+                self.request_save()
+            if merge_day_csvs(self.wb):
+                self.request_save()
+
+        if changed:
+            # Not on disk until the queued save runs, so read what we just wrote
+            self.students, self.names = students_from_rows(
+                self._students_ws.iter_rows(min_row=2, values_only=True)
+            )
+        else:
+            self.students, self.names = load_students(WORKBOOK_PATH)
+        self._name_keys = sorted(nm.casefold() for nm in self.names)  # sorted for prefix lookups
+        self._name_map = {nm.casefold(): nm for nm in self.names}
+        self._wb_mtime = self.workbook_mtime()
+
+    def reload_registry(self):
+        """
+        Re-open the workbook only if the file on disk changed since we last loaded/saved it
+        (someone edited the Excel file by hand); otherwise keep using the in-memory copy.
+        """
+        with self._wb_lock:
+            self.sync_with_disk()
+
+    def sync_with_disk(self):
+        """
+        If the file changed on disk, re-open it and re-apply our unsaved changes: sign-ins
+        come back from the day CSVs (open_workbook), added students are re-added here.
+        Call with self._wb_lock held, and before every save so edits made in Excel survive.
+        """
+        if self.workbook_mtime() == self._wb_mtime:
+            return
+        adds = self._pending_adds
+        self.open_workbook()
+        for name in adds:
+            ok, _msg = add_student_as_unregistered(
+                self._students_ws, name, self.students, self.names, self._col_widths
+            )
+            if ok:
+                key = _canon(name)
+                bisect.insort(self._name_keys, key)
+                self._name_map[key] = name
+                self.request_save()
+
+    def _save_locked(self):
+        """Save self.wb (merged with the file first, see sync_with_disk). Call with self._wb_lock held."""
+        self.sync_with_disk()
+        _atomic_save(self.wb, WORKBOOK_PATH)
+        self._wb_mtime = self.workbook_mtime()
+        self._unsaved = False
+        self._pending_adds = []
+        clear_day_csvs()
+
+    def workbook_mtime(self):
+        try:
+            return os.path.getmtime(WORKBOOK_PATH)
+        except OSError:
+            return None
+
+    def today_sheet(self):
+        """
+        Today's daily sheet, cached with its signed-in set until the date changes.
+        Call with self._wb_lock held.
+        """
+        today = date.today()
+        if today != self._today_date:
+            ws, sheet_name = get_or_create_daily_sheet(self.wb, today.strftime(DATE_FORMAT))
+            if self._today_name is not None and sheet_name != self._today_name:
+                # New day: write yesterday's sign-ins into the workbook (and drop its CSV)
+                self.request_save()
+            self._today_ws, self._today_name, self._today_date = ws, sheet_name, today
+            self._signed_today = load_signed_in(ws)
+        return self._today_ws
+
+    # ---- Saving ----
+    def request_save(self):
+        """Queue a workbook save on the background writer (returns immediately)."""
+        self._unsaved = True
+        if self._defer:
+            self._save_pending = True
+        else:
+            self._save_queue.put(1)
+
+    def autosize(self, ws):
+        """Autosize a sheet now, or once at the end of the current bulk_edit()."""
+        if self._defer:
+            self._dirty_sheets.add(ws.title)
+        else:
+            self._col_widths[ws.title] = autosize_columns(ws)
+
+    @contextlib.contextmanager
+    def bulk_edit(self):
+        """
+        Group several mutations: autosize + save requests made inside are deferred
+        and done once when the outermost block exits.
+        """
+        self._defer += 1
+        try:
+            yield
+        finally:
+            self._defer -= 1
+            if self._defer == 0:
+                for title in self._dirty_sheets:
+                    self._col_widths[title] = autosize_columns(self.wb[title])
+                self._dirty_sheets.clear()
+                if self._save_pending:
+                    self._save_pending = False
+                    self._save_queue.put(1)
+
+    def _saver_loop(self):
+        while True:
+            self._save_queue.get()
+            time.sleep(SAVE_COALESCE_SECONDS)
+            # Anything queued while we waited is covered by this one save
+            while True:
+                try:
+                    self._save_queue.get_nowait()
+                except queue.Empty:
+                    break
+            try:
+                with self._wb_lock:
+                    if self._unsaved:
+                        self._save_locked()
+            except Exception:
+                # e.g. the file is open in Excel on Windows, or half-written by Excel or a
+                # sync client (BadZipFile on re-open). Keep this thread alive and try again.
+                traceback.print_exc()
+                self.request_save()
+
+    def on_close(self):
+        """Write any pending changes synchronously, then exit."""
+        while True:
+            try:
+                with self._wb_lock:
+                    self.sync_with_disk()
+                    if self._unsaved:
+                        self._save_locked()
+                break
+            except (OSError, zipfile.BadZipFile) as e:
+                if not messagebox.askretrycancel("Save failed", f"Could not save workbook:\n{e}"):
+                    break
+        self.root.destroy()
 
     def reload_registry_ui(self):
         self.reload_registry()
@@ -298,11 +648,46 @@ class AttendanceApp:
     def set_status(self, msg, ok=True):
         self.status.config(text=msg, fg=("green" if ok else "red"))
 
-    def refresh_suggestions(self):
-        self.sugg_list.delete(0, tk.END)
-        typed = self.name_var.get()
-        for s in get_suggestions(typed, self.names):
-            self.sugg_list.insert(tk.END, s)
+    def on_key_release(self, event=None):
+        """Debounce: a burst of keystrokes triggers a single suggestion pass."""
+        if self._sugg_after:
+            self.root.after_cancel(self._sugg_after)
+        self._sugg_after = self.root.after(SUGGEST_DELAY_MS, self._do_refresh_suggestions)
+
+    def refresh_suggestions(self, t=None):
+        """
+        Refresh suggestions right away (drops any pending debounced refresh).
+        t: the text in _canon() form if the caller has it already (default: the entry's text).
+        """
+        if self._sugg_after:
+            self.root.after_cancel(self._sugg_after)
+        self._last_typed = None  # registry may have changed: recompute even if the text didn't
+        self._do_refresh_suggestions(t)
+
+    def _do_refresh_suggestions(self, t=None):
+        self._sugg_after = None
+        if t is None:
+            t = _canon(self.name_var.get())
+        if t == self._last_typed:
+            return  # arrows/shift/ctrl etc. fire <KeyRelease> without changing the text
+        self._last_typed = t
+        if len(t) < 2:
+            self.set_suggestions([])  # one letter would match half the registry
+            return
+        self.set_suggestions(get_suggestions_cf(t, self._name_keys, self._name_map))
+
+    def set_suggestions(self, new):
+        """Update the Listbox in place, touching only rows that changed."""
+        current = self._current_suggs
+        for i, s in enumerate(new):
+            if i >= len(current):
+                self.sugg_list.insert(tk.END, s)
+            elif current[i] != s:
+                self.sugg_list.delete(i)
+                self.sugg_list.insert(i, s)
+        if len(current) > len(new):
+            self.sugg_list.delete(len(new), tk.END)
+        self._current_suggs = list(new)
 
     def on_pick_suggestion(self, event=None):
         sel = self.sugg_list.curselection()
@@ -324,10 +709,17 @@ class AttendanceApp:
         # Re-load to keep registry current if someone edited Excel
         self.reload_registry()
 
-        matched = canonical_match(typed, self.students)
+        typed_cf = _canon(typed)
+        matched = canonical_match_cf(typed_cf, self.students)
         if matched:
             official_name, status = matched
-            sheet_name, did_log = log_attendance(self.wb, official_name, status)
+            with self._wb_lock:
+                ws = self.today_sheet()
+                sheet_name, did_log = log_attendance(
+                    ws, official_name, status, self._col_widths, self._signed_today
+                )
+                if did_log:
+                    self._unsaved = True  # saved with the next save (the day CSV has it meanwhile)
 
             if did_log:
                 self.set_status(f"Signed in: {official_name} ({status})", ok=True)
@@ -335,12 +727,13 @@ class AttendanceApp:
                 self.set_status(f"Already signed in today: {official_name}", ok=False)
 
             self.name_var.set("")
-            self.sugg_list.delete(0, tk.END)
+            self.set_suggestions([])
+            self._last_typed = ""
             self.entry.focus()
             return
 
         # Block attendance if not in Students
-        self.refresh_suggestions()
+        self.refresh_suggestions(typed_cf)
         if self.sugg_list.size() > 0:
             self.set_status("Name not recognized. Pick a suggestion or re-type.", ok=False)
         else:
@@ -379,11 +772,22 @@ class AttendanceApp:
                 return
 
             self.reload_registry()
-            ok, m = add_student_as_unregistered(self.wb, name)
+            with self._wb_lock:
+                ok, m = add_student_as_unregistered(
+                    self._students_ws, name, self.students, self.names, self._col_widths
+                )
+                if ok:
+                    self._pending_adds.append(name.strip())
             msg.config(text=m, fg=("green" if ok else "red"))
 
             if ok:
-                self.reload_registry_ui()
+                self.request_save()
+                # students/names were updated in place; keep the suggestion caches in step
+                official_name = name.strip()
+                key = _canon(official_name)
+                bisect.insort(self._name_keys, key)
+                self._name_map[key] = official_name
+                self.set_status("Registry refreshed.", ok=True)
                 self.name_var.set(name)
                 self.refresh_suggestions()
 
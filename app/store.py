@@ -0,0 +1,561 @@
+"""
+Workbook + log storage for the BUI Attendance kiosk (see web_app.py for the layout).
+
+No UI code here. openpyxl and rapidfuzz are imported inside the functions that need them,
+so importing this module (e.g. for its constants) stays cheap.
+"""
+
+import os
+import csv
+import zipfile
+from datetime import datetime
+from zoneinfo import ZoneInfo
+
+
+# -------------------------
+# Paths / constants
+# -------------------------
+PROJECT_ROOT = os.path.dirname(os.path.dirname(__file__))  # .../BUI_Attendance_Kiosk
+DATA_DIR = os.path.join(PROJECT_ROOT, "data")
+WORKBOOK_PATH = os.path.join(DATA_DIR, "BUI_Attendance.xlsx")
+LOG_CSV_PATH = os.path.join(DATA_DIR, "attendance_log.csv")
+LOG_EXPORT_PATH = os.path.join(DATA_DIR, "BUI_Attendance_Log.xlsx")
+
+# Raised while reading/writing the workbook when it is locked (e.g. open in Excel on
+# Windows) or half-written by another program; worth retrying later
+WORKBOOK_IO_ERRORS = (OSError, zipfile.BadZipFile)
+
+STUDENTS_SHEET = "Students"
+ATTENDANCE_SHEET = "Attendance"
+LOG_SHEET = "Attendance Log"
+LOG_SHEET_ARCHIVED = "Attendance Log (archived)"  # old in-workbook log, after copying it to the CSV
+LOG_HEADERS = ["Timestamp (MT)", "Name", "OfficialStatus", "Attendance Date", "Attendance (P/A)"]
+LOG_TS_FORMAT = "%Y-%m-%d %H:%M:%S"  # timestamps as stored in the CSV
+
+STATUS_REGISTERED = "Registered"
+STATUS_UNREGISTERED = "Unregistered"
+
+# Mountain Time
+MT_TZ = ZoneInfo("America/Edmonton")  # AB Mountain Time (handles DST)
+LATE_HOUR = 10
+LATE_MINUTE = 15
+TIME_STYLE = "mt_time"  # named style for sign-in times in the Attendance matrix
+LATE_STYLE = "late"  # TIME_STYLE + light red fill, for late sign-ins
+LOG_TS_STYLE = "mt_timestamp"  # named style for timestamps in the log export
+LATE_FILL_COLOR = "FFC7CE"  # light red
+
+
+# -------------------------
+# Helpers
+# -------------------------
+def ensure_data_dir():
+    os.makedirs(DATA_DIR, exist_ok=True)
+
+
+def autosize_columns(ws, cols=None):
+    """
+    Autosize columns (all by default, or just the column numbers in cols).
+    Scans whole columns, so call it once right before saving, for the columns that changed.
+    """
+    from openpyxl.utils import get_column_letter
+
+    if cols is None:
+        cols = range(1, ws.max_column + 1)
+    for col in cols:
+        max_len = 0
+        for values in ws.iter_cols(min_col=col, max_col=col, values_only=True):
+            for v in values:
+                if v is not None:
+                    max_len = max(max_len, len(str(v)))
+        ws.column_dimensions[get_column_letter(col)].width = min(max_len + 2, 45)
+
+
+def create_workbook(path):
+    """Save an empty workbook at path."""
+    from openpyxl import Workbook
+
+    Workbook().save(path)
+
+
+def open_workbook(path, read_only=False):
+    """Open the workbook; the app creates it once at startup (see create_workbook)."""
+    from openpyxl import load_workbook
+
+    return load_workbook(path, read_only=read_only)
+
+
+def ensure_named_styles(wb):
+    """Register the shared named styles once per workbook; cells refer to them by name."""
+    from openpyxl.styles import NamedStyle, PatternFill
+
+    if TIME_STYLE not in wb.named_styles:
+        wb.add_named_style(NamedStyle(name=TIME_STYLE, number_format="h:mm AM/PM"))
+    if LATE_STYLE not in wb.named_styles:
+        fill = PatternFill(start_color=LATE_FILL_COLOR, end_color=LATE_FILL_COLOR, fill_type="solid")
+        wb.add_named_style(NamedStyle(name=LATE_STYLE, number_format="h:mm AM/PM", fill=fill))
+
+
+def today_col_label(now_mt=None) -> str:
+    """
+    Column header format: '13-Sep', '4-Oct', etc. (no leading zero on day)
+    Uses Mountain Time date (now_mt, or the current time).
+    """
+    if now_mt is None:
+        now_mt = datetime.now(MT_TZ)
+    return f"{now_mt.day}-{now_mt.strftime('%b')}"
+
+
+# -------------------------
+# Students (registry)
+# -------------------------
+def get_or_create_students_sheet(wb):
+    """
+    The Students sheet, created or upgraded from the old layout if needed.
+    Not saved here; the caller saves when changed is True.
+    Returns: (ws, changed)
+    """
+    if STUDENTS_SHEET in wb.sheetnames:
+        ws = wb[STUDENTS_SHEET]
+
+        # Upgrade old version if needed
+        a1 = ws.cell(row=1, column=1).value
+        b1 = ws.cell(row=1, column=2).value if ws.max_column >= 2 else None
+
+        if a1 == "Registered Student Name" or (a1 == "Name" and b1 is None):
+            ws.cell(row=1, column=1, value="Name")
+            ws.cell(row=1, column=2, value="OfficialStatus")
+            for a, b in ws.iter_rows(min_row=2, max_col=2):
+                if a.value and not b.value:
+                    b.value = STATUS_REGISTERED
+            autosize_columns(ws, (1, 2))
+            return ws, True
+
+        return ws, False
+
+    ws = wb.create_sheet(STUDENTS_SHEET)
+    ws.append(["Name", "OfficialStatus"])
+    autosize_columns(ws)
+    return ws, True
+
+
+def load_students(wb):
+    """
+    Returns:
+      students: dict casefold(name) -> (official_name, status)
+    Official names (e.g. for suggestions) are the first items of students.values().
+    """
+    ws, _ = get_or_create_students_sheet(wb)
+    return students_from_rows(ws.iter_rows(min_row=2, max_col=2, values_only=True))
+
+
+def students_from_rows(rows):
+    """Build students as described in load_students from (name, status) Students rows."""
+    students = {}
+
+    for name, status in rows:
+        if not name:
+            continue
+        if not isinstance(name, str):
+            name = str(name)
+        name = name.strip()
+        if not name:
+            continue
+        if not status:
+            status = STATUS_UNREGISTERED
+        elif not isinstance(status, str):
+            status = str(status)
+        else:
+            status = status.strip()
+
+        key = name.casefold()
+        if key not in students:
+            students[key] = (name, status)
+
+    return students
+
+
+# -------------------------
+# Attendance matrix sheet
+# -------------------------
+def get_or_create_attendance_sheet(wb):
+    """
+    The Attendance sheet, created (or given its header) if needed.
+    Not saved here; the caller saves when changed is True.
+    Returns: (ws, changed)
+    """
+    if ATTENDANCE_SHEET in wb.sheetnames:
+        ws = wb[ATTENDANCE_SHEET]
+        if ws.max_row < 1 or ws.cell(row=1, column=1).value is None:
+            ws.append(["FULL NAME"])
+            autosize_columns(ws)
+            return ws, True
+        return ws, False
+
+    ws = wb.create_sheet(ATTENDANCE_SHEET)
+    ws.append(["FULL NAME"])
+    autosize_columns(ws)
+    return ws, True
+
+
+def index_attendance_sheet(ws):
+    """
+    One pass over the Attendance sheet to build lookup dicts (first occurrence wins):
+      row_by_key: casefold(name) -> row number
+      col_by_date: date label -> column number
+    Keep them alongside the workbook; the helpers below update them as they append.
+    """
+    row_by_key = {}
+    for r, (val,) in enumerate(ws.iter_rows(min_row=2, max_col=1, values_only=True), start=2):
+        if val:
+            row_by_key.setdefault(str(val).strip().casefold(), r)
+
+    col_by_date = {}
+    for col, val in enumerate(next(ws.iter_rows(min_row=1, max_row=1, values_only=True), ()), start=1):
+        if col >= 2 and val:
+            col_by_date.setdefault(str(val).strip(), col)
+
+    return row_by_key, col_by_date
+
+
+def ensure_date_column(ws, date_label: str, col_by_date: dict, dirty_cols: set) -> int:
+    """dirty_cols: gets the column number if a new column is added (autosize before saving)."""
+    col = col_by_date.get(date_label)
+    if col is not None:
+        return col
+
+    new_col = ws.max_column + 1
+    ws.cell(row=1, column=new_col, value=date_label)
+    col_by_date[date_label] = new_col
+    dirty_cols.add(new_col)
+    return new_col
+
+
+def find_or_create_student_row(ws, name: str, row_by_key: dict, dirty_cols: set) -> int:
+    """dirty_cols: gets column 1 if a new student row is added (autosize before saving)."""
+    target = name.strip().casefold()
+
+    row = row_by_key.get(target)
+    if row is not None:
+        return row
+
+    new_row = ws.max_row + 1
+    ws.cell(row=new_row, column=1, value=name.strip())
+    row_by_key[target] = new_row
+    dirty_cols.add(1)
+    return new_row
+
+
+def ensure_student_row_in_attendance(wb, name: str, row_by_key: dict):
+    """Add the student's Attendance row if missing. Not saved here; the caller saves."""
+    ws, _ = get_or_create_attendance_sheet(wb)
+    dirty_cols = set()
+    find_or_create_student_row(ws, name, row_by_key, dirty_cols)
+    autosize_columns(ws, dirty_cols)
+
+
+# -------------------------
+# Attendance log sheet
+# -------------------------
+def _write_log_rows(rows):
+    """
+    Append rows to the log CSV (header written when the file is new).
+    Row: [timestamp (datetime, or None/"" for A; other values written as text), name,
+          status, date_label, "P"/"A"]
+    """
+    is_new = not os.path.exists(LOG_CSV_PATH)
+    with open(LOG_CSV_PATH, "a", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        if is_new:
+            writer.writerow(LOG_HEADERS)
+        for ts, *rest in rows:
+            if isinstance(ts, datetime):
+                ts = ts.strftime(LOG_TS_FORMAT)
+            else:
+                ts = "" if ts is None else str(ts)  # e.g. legacy text timestamps, kept as-is
+            writer.writerow([ts, *rest])
+
+
+def _append_log_csv(row):
+    _write_log_rows([row])
+
+
+def read_log_csv():
+    """Yield the log CSV's rows (as lists of strings, header skipped)."""
+    if not os.path.exists(LOG_CSV_PATH):
+        return
+    with open(LOG_CSV_PATH, newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        next(reader, None)
+        yield from reader
+
+
+def load_log_index() -> set:
+    """
+    (date_label, casefold(name)) for every row in the log CSV. Built once at load; keep it
+    and add to it whenever a log row is written, instead of re-reading the log.
+    """
+    index = set()
+    for row in read_log_csv():
+        nm = row[1].strip().casefold() if len(row) > 1 else ""
+        dt = row[3].strip() if len(row) > 3 else ""
+        if nm and dt:
+            index.add((dt, nm))
+    return index
+
+
+def seed_log_csv_from_sheet(wb) -> bool:
+    """
+    One-time migration: copy an older "Attendance Log" sheet into the CSV (unless the CSV
+    already exists), then rename the sheet to LOG_SHEET_ARCHIVED so it is not mistaken for
+    the current log. Returns True if wb changed; the caller saves.
+    """
+    if LOG_SHEET not in wb.sheetnames:
+        return False
+    ws = wb[LOG_SHEET]
+    if not os.path.exists(LOG_CSV_PATH):
+        rows = []
+        for row in ws.iter_rows(min_row=2, max_col=5, values_only=True):
+            if not row[1] or row[0] == LOG_HEADERS[0]:  # skip blanks + repeated header rows
+                continue
+            rows.append(["" if v is None else v for v in row])
+        if rows:
+            _write_log_rows(rows)
+    ws.title = LOG_SHEET_ARCHIVED
+    return True
+
+
+def export_log_workbook():
+    """
+    Write the whole log CSV to LOG_EXPORT_PATH (sheet "Attendance Log").
+    Uses a write-only workbook and reads the CSV twice (column widths, then the rows), so
+    only one row is held in memory at a time. Timestamps that do not parse (e.g. migrated
+    by hand) are written as text.
+    """
+    from openpyxl import Workbook
+    from openpyxl.cell import WriteOnlyCell
+    from openpyxl.styles import NamedStyle
+    from openpyxl.utils import get_column_letter
+
+    widths = [len(h) for h in LOG_HEADERS]
+    for row in read_log_csv():
+        for i, v in enumerate(row[:len(widths)]):
+            widths[i] = max(widths[i], len(v))
+
+    wb = Workbook(write_only=True)
+    wb.add_named_style(NamedStyle(name=LOG_TS_STYLE, number_format="yyyy-mm-dd h:mm AM/PM"))
+    ws = wb.create_sheet(LOG_SHEET)
+    for i, w in enumerate(widths, 1):
+        ws.column_dimensions[get_column_letter(i)].width = min(w + 2, 45)
+
+    ws.append(LOG_HEADERS)
+    for ts, *rest in read_log_csv():
+        if ts:
+            try:
+                cell = WriteOnlyCell(ws, value=datetime.strptime(ts, LOG_TS_FORMAT))
+            except ValueError:
+                cell = None
+            if cell is not None:
+                cell.style = LOG_TS_STYLE
+                ts = cell
+        ws.append([ts or None, *rest])
+    wb.save(LOG_EXPORT_PATH)
+
+
+# -------------------------
+# Add students
+# -------------------------
+def add_student_as_unregistered(wb, name: str, row_by_key: dict):
+    """Add to Students as Unregistered (+ Attendance row). Not saved here; the caller saves."""
+    name = name.strip()
+    if not name:
+        return False, "Name cannot be empty."
+
+    students = load_students(wb)
+    if name.casefold() in students:
+        return False, "That student already exists in Students."
+
+    ws, _ = get_or_create_students_sheet(wb)
+    ws.append([name, STATUS_UNREGISTERED])
+    autosize_columns(ws, (1, 2))
+
+    # Ensure they appear in Attendance immediately
+    ensure_student_row_in_attendance(wb, name, row_by_key)
+
+    return True, f"Added as Unregistered: {name}"
+
+
+# -------------------------
+# Matching / suggestions
+# -------------------------
+def canonical_match(typed: str, students: dict):
+    t = typed.strip()
+    if not t:
+        return None
+    return students.get(t.casefold())
+
+
+def get_suggestions(typed: str, names: list[str], names_cf: list[str], n=6):
+    """names_cf: casefolded names, parallel to names (built once per registry load)."""
+    t = typed.strip()
+    if not t:
+        return []
+    from rapidfuzz import process, fuzz
+
+    close = process.extract(t.casefold(), names_cf, scorer=fuzz.WRatio, limit=n, score_cutoff=70)
+    return [names[i] for _key, _score, i in close]
+
+
+# -------------------------
+# Present + Late marking
+# -------------------------
+def mark_present(wb, name: str, status: str, row_by_key: dict, log_index: set, now_mt, today):
+    """
+    Mark the student present (matrix time + log "P"). Not saved here; the caller saves.
+    log_index: see load_log_index; updated here.
+    today: (date_label, date column, late cutoff) for now_mt's date (see AttendanceApp.today in ui.py).
+    wb must have the named styles registered (see ensure_named_styles).
+    """
+    date_label, col, late_cutoff = today
+
+    ws, _ = get_or_create_attendance_sheet(wb)
+    dirty_cols = set()
+    row = find_or_create_student_row(ws, name, row_by_key, dirty_cols)
+
+    cell = ws.cell(row=row, column=col)
+
+    # Prevent duplicates for today
+    if cell.value is not None and str(cell.value).strip() != "":
+        return date_label, False, f"Already signed in for {date_label}."
+
+    # Store time in the matrix cell
+    cell.value = now_mt.time()
+    cell.style = LATE_STYLE if now_mt > late_cutoff else TIME_STYLE
+
+    # Log P
+    _append_log_csv([now_mt.replace(tzinfo=None), name, status, date_label, "P"])
+    log_index.add((date_label, name.strip().casefold()))
+
+    autosize_columns(ws, dirty_cols)
+    time_str = now_mt.strftime("%I:%M %p").lstrip("0")
+    return date_label, True, f"Signed in ({status}) at {time_str} MT on {date_label}."
+
+
+def apply_logged_sign_ins(wb, date_label: str, row_by_key: dict, col_by_date: dict) -> int:
+    """
+    Copy the log's "P" rows for date_label into blank Attendance matrix cells, e.g. sign-ins
+    that were not saved yet when the workbook was re-opened. Returns how many were written.
+    A timestamp that does not parse is copied as text. Not saved here; the caller saves.
+    wb needs the named styles (see ensure_named_styles).
+    """
+    ws, _ = get_or_create_attendance_sheet(wb)
+    dirty_cols = set()
+    col = None
+    written = 0
+
+    for row in read_log_csv():
+        if len(row) < 5 or not row[0] or row[3].strip() != date_label or row[4].strip() != "P":
+            continue
+        try:
+            ts = datetime.strptime(row[0], LOG_TS_FORMAT)
+        except ValueError:
+            ts = None
+        if col is None:
+            col = ensure_date_column(ws, date_label, col_by_date, dirty_cols)
+        r = find_or_create_student_row(ws, row[1], row_by_key, dirty_cols)
+
+        cell = ws.cell(row=r, column=col)
+        if cell.value is not None and str(cell.value).strip() != "":
+            continue
+        if ts is None:
+            cell.value = row[0]
+        else:
+            late_cutoff = ts.replace(hour=LATE_HOUR, minute=LATE_MINUTE, second=0, microsecond=0)
+            cell.value = ts.time()
+            cell.style = LATE_STYLE if ts > late_cutoff else TIME_STYLE
+        dirty_cols.add(col)
+        written += 1
+
+    autosize_columns(ws, dirty_cols)
+    return written
+
+
+# -------------------------
+# Finalize day: fill A + produce full P/A log
+# -------------------------
+def finalize_today(wb, row_by_key: dict, col_by_date: dict, log_index: set):
+    """
+    Finalize the session for today:
+    - Ensure all Students exist as rows in Attendance
+    - Ensure today's date column exists
+    - Fill "A" for blanks in today's date column
+    - Ensure the Attendance Log CSV has one row per student for today:
+        - P for present
+        - A for absent
+      Timestamp blank for A; for P, timestamp is taken from the matrix time if missing.
+    - Re-export the log workbook (LOG_EXPORT_PATH) from the CSV
+    log_index (see load_log_index) tells which log rows exist already; updated here.
+    The main workbook is not saved here; the caller saves.
+    """
+    students = load_students(wb)
+    now_mt = datetime.now(MT_TZ)
+    date_label = today_col_label(now_mt)
+
+    att_ws, _ = get_or_create_attendance_sheet(wb)
+    dirty_cols = set()
+    col = ensure_date_column(att_ws, date_label, col_by_date, dirty_cols)
+    dirty_cols.add(col)  # "A" marks are written below
+
+    # Ensure every student has a row (row_by_key is kept up to date as rows are added).
+    # max_row scans every cell, so read it once and count new rows locally.
+    next_row = att_ws.max_row + 1
+    for key, (official_name, _status) in students.items():
+        if key not in row_by_key:
+            att_ws.cell(row=next_row, column=1, value=official_name)
+            row_by_key[key] = next_row
+            dirty_cols.add(1)
+            next_row += 1
+
+    new_log_rows = []
+
+    # Today's column in one read; only the "A" cells are written back
+    col_values = next(att_ws.iter_cols(
+        min_col=col, max_col=col, min_row=2, max_row=next_row - 1, values_only=True
+    ))
+    updates = []
+
+    # Fill A + write missing log rows
+    for key, (official_name, status) in students.items():
+        r = row_by_key[key]
+        val = col_values[r - 2]
+
+        # Determine P/A
+        if val is not None and str(val).strip() != "" and str(val).strip().upper() != "A":
+            pa = "P"
+            # If we need to create a missing P log row, build timestamp using the time in the cell
+            ts = None
+            if hasattr(val, "hour"):  # time object
+                ts = now_mt.replace(
+                    hour=val.hour,
+                    minute=val.minute,
+                    second=getattr(val, "second", 0),
+                    microsecond=0
+                ).replace(tzinfo=None)
+        else:
+            # Absent: mark A in the matrix
+            updates.append((r, "A"))
+            pa = "A"
+            ts = ""  # blank timestamp for A
+
+        # Write log if missing
+        if (date_label, key) not in log_index:
+            new_log_rows.append([ts, official_name, status, date_label, pa])
+            log_index.add((date_label, key))
+
+    for r, v in updates:
+        att_ws.cell(row=r, column=col, value=v)
+
+    _write_log_rows(new_log_rows)
+    export_log_workbook()
+
+    autosize_columns(att_ws, dirty_cols)
+    return date_label
@@ -0,0 +1,379 @@
+"""
+Tkinter kiosk window for BUI Attendance (see web_app.py). Sheet/log work lives in store.py.
+"""
+
+import os
+import time
+from datetime import datetime
+import tkinter as tk
+from tkinter import messagebox
+
+import store
+
+
+# -------------------------
+# UI timing
+# -------------------------
+SAVE_DELAY_MS = 2000  # sign-ins within this window share one workbook save
+SAVE_MAX_DELAY_MS = 10000  # ...but save at most this long after the first unsaved change
+SUGGEST_DELAY_MS = 120  # wait this long after the last keystroke before suggesting
+
+
+# -------------------------
+# UI
+# -------------------------
+class AttendanceApp:
+    def __init__(self, root):
+        self.root = root
+        self.root.title("BUI Attendance")
+        self.root.configure(bg="white")
+
+        # Kiosk full screen (ESC to exit)
+        self.KIOSK_MODE = True
+        if self.KIOSK_MODE:
+            self.root.attributes("-fullscreen", True)
+            self.root.bind("<Escape>", lambda e: self.root.attributes("-fullscreen", False))
+
+        self._dirty = False      # in-memory changes not yet written to disk
+        self._dirty_since = 0.0  # time.monotonic() of the first unsaved change
+        self._pending_adds = []  # students added since the last save (see _reopen_keeping_pending)
+        self._save_after = None  # pending Tk after() id for the debounced save
+        self.root.protocol("WM_DELETE_WINDOW", self.on_close)
+
+        self.open_workbook()
+
+        tk.Label(root, text="BUI Attendance", font=("Arial", 34, "bold"), bg="white").pack(pady=(40, 10))
+        tk.Label(root, text="Type your full name and press Enter", font=("Arial", 18), bg="white").pack(pady=(0, 20))
+
+        self.name_var = tk.StringVar()
+        self.entry = tk.Entry(root, textvariable=self.name_var, font=("Arial", 26), width=32, justify="center")
+        self.entry.pack(pady=10)
+        self.entry.focus()
+
+        self.status = tk.Label(root, text="", font=("Arial", 16), bg="white")
+        self.status.pack(pady=(10, 10))
+
+        tk.Label(root, text="Suggestions (click one if yours is here):", font=("Arial", 14), bg="white").pack(pady=(10, 5))
+        self.sugg_list = tk.Listbox(root, font=("Arial", 16), height=6, width=34)
+        self.sugg_list.pack(pady=(0, 15))
+        self.sugg_list.bind("<<ListboxSelect>>", self.on_pick_suggestion)
+
+        btn_frame = tk.Frame(root, bg="white")
+        btn_frame.pack(pady=10)
+
+        tk.Button(btn_frame, text="Submit", font=("Arial", 18), command=self.on_submit).grid(row=0, column=0, padx=10)
+        tk.Button(btn_frame, text="Add New Student (Unregistered)", font=("Arial", 18), command=self.open_add_student).grid(row=0, column=1, padx=10)
+        tk.Button(btn_frame, text="Refresh Registry", font=("Arial", 18), command=self.reload_registry_ui).grid(row=0, column=2, padx=10)
+
+        tk.Button(
+            btn_frame,
+            text="Finalize Today (Fill A + Log)",
+            font=("Arial", 18),
+            command=self.on_finalize
+        ).grid(row=1, column=0, columnspan=3, pady=10)
+
+        self.root.bind("<Return>", self.on_submit)
+        self._sugg_after = None  # pending Tk after() id for debounced suggestions
+        self.entry.bind("<KeyRelease>", self.on_key_release)
+
+        tk.Label(
+            root,
+            text=f"Workbook saves to: {store.WORKBOOK_PATH}",
+            font=("Arial", 12),
+            bg="white",
+            fg="#666"
+        ).pack(side="bottom", pady=20)
+
+    def _ensure_workbook_exists(self):
+        """Create an empty workbook if there is none (first run, or the file was moved away)."""
+        if not os.path.exists(store.WORKBOOK_PATH):
+            store.ensure_data_dir()
+            store.create_workbook(store.WORKBOOK_PATH)
+
+    def open_workbook(self):
+        """Load the workbook + Students registry and keep them in memory."""
+        self._ensure_workbook_exists()
+        self._wb_mtime = self.workbook_mtime()
+        # Indexes come from a streaming read-only pass; the editable workbook is opened after
+        ro = store.open_workbook(store.WORKBOOK_PATH, read_only=True)
+        try:
+            self._index_attendance(ro)
+            self._index_students(ro)
+        finally:
+            ro.close()
+
+        self.wb = store.open_workbook(store.WORKBOOK_PATH)
+        store.ensure_named_styles(self.wb)
+        _ws, students_changed = store.get_or_create_students_sheet(self.wb)
+        _ws, attendance_changed = store.get_or_create_attendance_sheet(self.wb)
+        # A sheet created/upgraded just now differs from what the read-only pass saw
+        if students_changed:
+            self._index_students(self.wb)
+        if attendance_changed:
+            self._index_attendance(self.wb)
+        log_archived = store.seed_log_csv_from_sheet(self.wb)
+        self._log_index = store.load_log_index()
+        self._today_date = None  # column numbers may have changed; see today()
+        # Sign-ins logged but not saved to the matrix (re-opened after an Excel edit, or
+        # the kiosk stopped before its deferred save) come back from the log CSV
+        restored = store.apply_logged_sign_ins(
+            self.wb, store.today_col_label(), self._att_row_by_key, self._att_col_by_date
+        )
+        if students_changed or attendance_changed or log_archived or restored:
+            self._mark_dirty()  # save the above with the next save
+
+    def today(self, now_mt):
+        """
+        (date_label, date column, late cutoff) for now_mt's MT date. Cached until the date
+        changes (or the workbook is reopened); the date column is added if missing.
+        """
+        if now_mt.date() != self._today_date:
+            ws, _ = store.get_or_create_attendance_sheet(self.wb)
+            dirty_cols = set()
+            self._today_label = store.today_col_label(now_mt)
+            self._today_col = store.ensure_date_column(ws, self._today_label, self._att_col_by_date, dirty_cols)
+            store.autosize_columns(ws, dirty_cols)
+            self._late_cutoff = now_mt.replace(
+                hour=store.LATE_HOUR, minute=store.LATE_MINUTE, second=0, microsecond=0
+            )
+            self._today_date = now_mt.date()
+        return self._today_label, self._today_col, self._late_cutoff
+
+    def _index_attendance(self, wb):
+        """Attendance row/column lookups from wb (may be a read-only workbook)."""
+        if store.ATTENDANCE_SHEET in wb.sheetnames:
+            self._att_row_by_key, self._att_col_by_date = store.index_attendance_sheet(wb[store.ATTENDANCE_SHEET])
+        else:
+            self._att_row_by_key, self._att_col_by_date = {}, {}
+
+    def _index_students(self, wb):
+        """The Students registry from wb (may be a read-only workbook)."""
+        if store.STUDENTS_SHEET in wb.sheetnames:
+            rows = wb[store.STUDENTS_SHEET].iter_rows(min_row=2, max_col=2, values_only=True)
+        else:
+            rows = ()
+        self.students = store.students_from_rows(rows)
+        self._cache_names()
+
+    def _cache_names(self):
+        """Suggestion lists from self.students: official names + their casefolded keys."""
+        self.names = [name for name, _status in self.students.values()]
+        self._names_cf = list(self.students)
+
+    def _reopen_keeping_pending(self):
+        """
+        Re-open the workbook (changed on disk, e.g. edited in Excel) and re-apply the changes
+        not saved yet: added students here, today's sign-ins in open_workbook.
+        """
+        adds = self._pending_adds
+        self.open_workbook()
+        for name in adds:
+            ok, _msg = store.add_student_as_unregistered(self.wb, name, self._att_row_by_key)
+            if ok:
+                self.students[name.casefold()] = (name, store.STATUS_UNREGISTERED)
+        self._cache_names()
+
+    def reload_registry(self, force=False):
+        """Re-open the workbook only if it changed on disk (edited in Excel) or when forced."""
+        mtime = self.workbook_mtime()
+        if mtime is None and self._wb_mtime is not None:
+            self._flush_now()  # file moved away while running: put our copy back
+            return
+        changed = mtime != self._wb_mtime
+        if self._dirty and (force or changed):
+            self._flush_now()  # merges the file's changes with ours (see _flush_now)
+            changed = False
+        if force or changed:
+            self.open_workbook()
+
+    def workbook_mtime(self):
+        try:
+            return os.stat(store.WORKBOOK_PATH).st_mtime
+        except OSError:
+            return None
+
+    def _mark_dirty(self):
+        """
+        Schedule a save SAVE_DELAY_MS from now; further changes push it back, up to
+        SAVE_MAX_DELAY_MS after the first unsaved change.
+        """
+        now = time.monotonic()
+        if not self._dirty:
+            self._dirty_since = now
+        self._dirty = True
+        if self._save_after:
+            self.root.after_cancel(self._save_after)
+        waited_ms = (now - self._dirty_since) * 1000
+        delay_ms = max(0, min(SAVE_DELAY_MS, SAVE_MAX_DELAY_MS - waited_ms))
+        self._save_after = self.root.after(int(delay_ms), self._flush_if_dirty)
+
+    def _flush_if_dirty(self):
+        self._save_after = None
+        if not self._dirty:
+            return
+        try:
+            self._flush_now()
+        except store.WORKBOOK_IO_ERRORS as e:
+            self.set_status(f"Could not save the workbook (open in Excel?); retrying: {e}", ok=False)
+            self._dirty_since = time.monotonic()  # retry in SAVE_DELAY_MS, not right away
+            self._mark_dirty()
+
+    def _flush_now(self):
+        """
+        Save now. If the file changed on disk since we loaded/saved it, it is re-opened and
+        our unsaved changes re-applied first, so edits made in Excel are not overwritten.
+        If the file is gone, the in-memory workbook is written in its place.
+        """
+        if self._save_after:
+            self.root.after_cancel(self._save_after)
+            self._save_after = None
+        mtime = self.workbook_mtime()
+        if mtime is not None and mtime != self._wb_mtime:
+            self._reopen_keeping_pending()
+        elif mtime is None:
+            store.ensure_data_dir()  # file gone: nothing to merge, write our copy
+        self.wb.save(store.WORKBOOK_PATH)
+        self._dirty = False
+        self._pending_adds = []
+        self._wb_mtime = self.workbook_mtime()
+
+    def on_close(self):
+        """Write any pending changes, then exit."""
+        while self._dirty:
+            try:
+                self._flush_now()
+            except store.WORKBOOK_IO_ERRORS as e:
+                if not messagebox.askretrycancel("Save failed", f"Could not save workbook:\n{e}"):
+                    break
+        self.root.destroy()
+
+    def reload_registry_ui(self):
+        self.reload_registry(force=True)
+        self.set_status("Registry refreshed.", ok=True)
+        self.refresh_suggestions()
+
+    def set_status(self, msg, ok=True):
+        self.status.config(text=msg, fg=("green" if ok else "red"))
+
+    def on_key_release(self, event=None):
+        """Debounce: a burst of keystrokes triggers a single suggestion pass."""
+        if self._sugg_after:
+            self.root.after_cancel(self._sugg_after)
+        self._sugg_after = self.root.after(SUGGEST_DELAY_MS, self.refresh_suggestions)
+
+    def refresh_suggestions(self):
+        if self._sugg_after:
+            self.root.after_cancel(self._sugg_after)
+            self._sugg_after = None
+        items = store.get_suggestions(self.name_var.get(), self.names, self._names_cf)
+        self.sugg_list.delete(0, tk.END)
+        if items:
+            self.sugg_list.insert(tk.END, *items)  # one Tk call for the whole list
+
+    def on_pick_suggestion(self, event=None):
+        sel = self.sugg_list.curselection()
+        if not sel:
+            return
+        picked = self.sugg_list.get(sel[0])
+        self.name_var.set(picked)
+        self.entry.icursor(tk.END)
+        self.entry.focus()
+        self.set_status("Selected suggested name. Press Enter to sign in.", ok=True)
+
+    def on_submit(self, event=None):
+        typed = self.name_var.get().strip()
+        if not typed:
+            self.set_status("Please enter your name.", ok=False)
+            return
+
+        self.reload_registry()  # one os.stat; re-opens only if the file was edited elsewhere
+        matched = store.canonical_match(typed, self.students)
+        if matched:
+            official_name, status = matched
+            now_mt = datetime.now(store.MT_TZ)
+            date_label, did_mark, msg = store.mark_present(
+                self.wb, official_name, status, self._att_row_by_key, self._log_index,
+                now_mt, self.today(now_mt)
+            )
+            if did_mark:
+                self._mark_dirty()
+            self.set_status(f"{official_name}: {msg}", ok=did_mark)
+
+            self.name_var.set("")
+            self.sugg_list.delete(0, tk.END)
+            self.entry.focus()
+            return
+
+        self.refresh_suggestions()
+        if self.sugg_list.size() > 0:
+            self.set_status("Name not recognized. Pick a suggestion or re-type.", ok=False)
+        else:
+            self.set_status("Name not recognized. Ask an admin to add you.", ok=False)
+
+    def on_finalize(self):
+        self.reload_registry()
+        date_label = store.finalize_today(
+            self.wb, self._att_row_by_key, self._att_col_by_date, self._log_index
+        )
+        self._flush_now()
+        self.set_status(f"Finalized {date_label}: Absences marked + Log created.", ok=True)
+
+    def open_add_student(self):
+        win = tk.Toplevel(self.root)
+        win.title("Add New Student (Unregistered)")
+        win.configure(bg="white")
+        win.geometry("650x280")
+
+        tk.Label(win, text="Add New Student (Unregistered)", font=("Arial", 18, "bold"), bg="white").pack(pady=(15, 10))
+        tk.Label(
+            win,
+            text="Only use this if the student is NOT in the official system.\nThey will be marked as Unregistered in Students.",
+            font=("Arial", 12),
+            bg="white"
+        ).pack(pady=(0, 10))
+
+        new_var = tk.StringVar()
+        e = tk.Entry(win, textvariable=new_var, font=("Arial", 18), width=32, justify="center")
+        e.pack(pady=10)
+        e.focus()
+
+        msg = tk.Label(win, text="", font=("Arial", 12), bg="white")
+        msg.pack(pady=5)
+
+        def do_add():
+            name = new_var.get().strip()
+            if not name:
+                msg.config(text="Name cannot be empty.", fg="red")
+                return
+
+            if not messagebox.askyesno("Confirm", f"Add '{name}' as Unregistered?"):
+                return
+
+            self.reload_registry()
+            ok, m = store.add_student_as_unregistered(self.wb, name, self._att_row_by_key)
+            msg.config(text=m, fg=("green" if ok else "red"))
+
+            if ok:
+                official_name = name.strip()
+                self._pending_adds.append(official_name)
+                self._mark_dirty()
+                # Keep the in-memory registry in step instead of re-reading the sheet
+                self.students[official_name.casefold()] = (official_name, store.STATUS_UNREGISTERED)
+                self._cache_names()
+                self.set_status("Registry refreshed.", ok=True)
+                self.name_var.set(name)
+                self.refresh_suggestions()
+
+        tk.Button(win, text="Add as Unregistered", font=("Arial", 14), command=do_add).pack(pady=10)
+        tk.Button(win, text="Close", font=("Arial", 12), command=win.destroy).pack(pady=5)
+        win.bind("<Return>", lambda e: do_add())
+
+
+def main():
+    root = tk.Tk()
+    AttendanceApp(root)
+    root.mainloop()
+
+
+if __name__ == "__main__":
+    main()